@@ -0,0 +1,58 @@
+"""Measures cache load and save throughput of every available serializer.
+
+Run with `python -m benchmarks.serializer` from the repository root.
+"""
+
+import random
+import string
+import time
+from datetime import datetime
+
+from github_random_star.serializer import available_serializers
+
+SIZES = (10_000, 50_000, 100_000)
+ROUNDS = 5
+
+
+def generate_cache(size: int) -> dict:
+    def name() -> str:
+        return "".join(random.choices(string.ascii_lowercase, k=12))
+
+    data = [f"{name()}/{name()}" for _ in range(size)]
+    return {
+        "data": data,
+        "ignore": data[:100],
+        "history": data[100:200],
+        "version": "1.2.0",
+        "date": datetime.now().isoformat(),
+        "account": "ddkasa",
+    }
+
+
+def measure(func, *args) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    random.seed(0)
+    print(f"{'backend':<10}{'entries':>10}{'load/s':>14}{'save/s':>14}{'MiB':>8}")
+    for size in SIZES:
+        cache = generate_cache(size)
+        for serializer in available_serializers():
+            raw = serializer.encode(cache)
+            load = measure(serializer.decode_cache, raw)
+            save = measure(serializer.encode, cache)
+            print(
+                f"{serializer.NAME:<10}{size:>10}"
+                f"{size / load:>14,.0f}{size / save:>14,.0f}"
+                f"{len(raw) / 1024**2:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,22 @@
-from abc import ABC
-import json
+from abc import ABC, abstractmethod
 import logging
 from datetime import datetime
 from pathlib import Path
 import random
 import time
 from typing import Any, Final, Optional
-
-from httpx import Client, codes
-
+from urllib.parse import parse_qs, urlparse
+
+from httpx import USE_CLIENT_DEFAULT, Client, Response, codes
+
+from github_random_star.cache import CacheIndex
+from github_random_star.serializer import (
+    CACHE_FORMAT,
+    SERIALIZER,
+    SerializationError,
+)
+from github_random_star.stats import PerformanceStats
+from github_random_star.tokens import TokenPool
 from github_random_star.version import __version__, Version
 
 log = logging.getLogger("github-random-star")
@@ -20,25 +28,40 @@ class GithubAPI(ABC):
     Handles fetching starred items from the GitHub API and cache.
 
     Methods:
-        create_headers: Creates the headers for the API request.
+        create_headers: Creates the shared headers for the API requests.
         collect_items: Main method that run the the class.
-        get_items: Fetches starred items from the API.
+        probe: Cheaply fingerprints the items to detect changes.
+        count_items: Reads the total amount of items from the API.
+        sample_items: Randomly samples items without crawling every page.
+        request: Fetches a decoded page from the API.
+        fetch: Fetches a raw response from the API.
         load_items: Loads cached items from the cache.
+        recover_items: Recovers the user lists of an invalid cache.
         save_items: Formats saves cached items to a json file.
 
     Attributes:
         API_BASE_URL: Base URL for GitHub API.
-        STARR_API_URL: URL endpoint template for fetching starred items.
+        USER_PARAMS: URL endpoint template for fetching items.
+        PER_PAGE: Amount of items requested per page.
+        NAME: Name of the child command used to key statistics.
         CACHE_PATH: Name of the cache file to seperate child commands.
         account: GitHub account name.
         cache_path: Path to the cache folder.
         refresh: Whether to refresh the cache.
+        force: Whether to refresh even if the probe detects no changes.
         max_results: Maximum number of starred items to return.
         client: Persistent client for requests.
+        tokens: Pool of API tokens rotated by their remaining rate limit.
+        stats: Optional cumulative performance statistics to record into.
+        index: Optional cache index recording every cache access.
+        requests: Amount of requests sent by this instance.
+        received: Amount of bytes received by this instance.
     """
 
     API_BASE_URL: Final[str] = "https://api.github.com/"
     USER_PARAMS: str = "users/{user}/"
+    PER_PAGE: int = 30
+    NAME: str
     CACHE_PATH: str
 
     __slots__ = (
@@ -48,6 +71,12 @@ class GithubAPI(ABC):
         "max_results",
         "client",
         "version",
+        "stats",
+        "requests",
+        "received",
+        "tokens",
+        "force",
+        "index",
     )
 
     def __init__(
@@ -56,26 +85,35 @@ class GithubAPI(ABC):
         cache_location: Path,
         *,
         refresh: bool = False,
+        force: bool = False,
         max_results: Optional[int] = None,
         token: Optional[str] = None,
+        tokens: Optional[TokenPool] = None,
+        stats: Optional[PerformanceStats] = None,
+        index: Optional[CacheIndex] = None,
     ) -> None:
         self.account = account
         self.cache_path = cache_location
         self.refresh = refresh
+        self.force = force
         self.max_results = max_results
         self.version = Version.process_version(__version__)
+        self.stats = stats
+        self.index = index
+        self.requests = 0
+        self.received = 0
+        self.tokens = tokens if tokens is not None else TokenPool([token or ""])
         self.client = Client(
-            headers=self.create_headers(token),
+            headers=self.create_headers(),
             base_url=self.API_BASE_URL,
             timeout=20,
         )
 
-    def create_headers(self, token: Optional[str] = None) -> dict:
+    def create_headers(self) -> dict:
         headers = {"X-GitHub-Api-Version": "2022-11-28"}
 
-        if token:
-            log.info("Using provided GitHub API token")
-            headers["Authorization"] = f"Bearer {token}"
+        if self.tokens:
+            log.info("Using %s provided GitHub API token(s)", len(self.tokens))
         else:
             log.warning(
                 "No GitHub API token provided. "
@@ -84,29 +122,58 @@ class GithubAPI(ABC):
 
         return headers
 
+    @property
+    def cache_file(self) -> Path:
+        return self.cache_path / Path(self.CACHE_PATH.format(account=self.account))
+
+    @property
+    def stats_key(self) -> str:
+        return f"{self.NAME}:{self.account}"
+
     def collect_items(self) -> dict[str, Any]:
         """Main method that runs the the class functionality.
 
-        If the cache is valid, it will load it. Otherwise, it will request
-        the data from the API and keep requesting until a page is not found or
-        the maximum number of results is reached.
+        If the cache is valid, it will load it. When refreshing, a cheap probe
+        is compared with the cache first and the refresh is skipped if nothing
+        changed and the cache holds every item allowed by `max_results`.
+        Otherwise, it will request the data from the API and keep requesting
+        until a page is not found or the maximum number of results is reached.
 
         Returns:
             dict: A dictionary with all the data needed to run the main script.
         """
         cache = self.load_items()
-        if cache and not self.refresh:
+        probe = None
+        probed = unchanged = False
+        if cache and self.refresh and not self.force:
+            probe = self.probe()
+            probed = True
+            if probe is not None and probe == cache.get("probe"):
+                expected = probe["count"]
+                if self.max_results:
+                    expected = min(expected, self.max_results)
+                unchanged = len(cache["data"]) == expected
+            if unchanged:
+                log.info("Nothing changed since the last refresh. Using cache.")
+
+        if self.stats is not None:
+            hit = bool(cache and (not self.refresh or unchanged))
+            self.stats.record_cache(self.stats_key, hit=hit)
+        if cache and (not self.refresh or unchanged):
             return cache
 
         log.info("Requesting data from Github")
+        start = time.perf_counter()
+        requests, received = self.requests, self.received
+        if not probed:
+            probe = self.probe()
 
         data = set()
 
         page = 1
         while True:
             log.debug("Requesting GH items page: %s", page)
-            url = self.USER_PARAMS.format(user=self.account, page=page)
-            response = self.request(url)
+            response = self.request(self.format_url(page))
             if not response:
                 break
 
@@ -119,10 +186,138 @@ class GithubAPI(ABC):
                 break
 
             page += 1
-        return self.save_items(data, cache)
 
-    def request(self, url: str, *, retry: bool = True) -> dict | None:
-        response = self.client.get(url)
+        if self.stats is not None:
+            self.stats.record_refresh(
+                self.stats_key,
+                time.perf_counter() - start,
+                self.requests - requests,
+                self.received - received,
+            )
+
+        if cache is None:
+            cache = self.recover_items()
+
+        return self.save_items(data, cache, probe=probe)
+
+    @abstractmethod
+    def probe(self) -> dict[str, Any] | None:
+        """Cheaply fingerprints the items of the account with one request.
+
+        Returns:
+            dict | None: Total count and newest change of the items or None
+                if the probe failed.
+        """
+
+    def format_url(self, page: int, per_page: Optional[int] = None) -> str:
+        return self.USER_PARAMS.format(
+            user=self.account,
+            page=page,
+            per_page=per_page or self.PER_PAGE,
+        )
+
+    def count_items(self) -> int:
+        """Reads the total amount of items without crawling every page.
+
+        Requests a single item per page so the page number of the `last`
+        link in the response headers equals the total amount of items.
+
+        Returns:
+            int: Total amount of items the account has.
+        """
+        response = self.fetch(self.format_url(1, per_page=1))
+        if response is None:
+            return 0
+
+        return self._count(response)
+
+    @staticmethod
+    def _count(response: Response) -> int:
+        last = response.links.get("last")
+        if last is None:
+            return len(response.json())
+
+        return int(parse_qs(urlparse(last["url"]).query)["page"][0])
+
+    def sample_items(self, total: int) -> list[str]:
+        """Uniformly samples items by only fetching the pages required.
+
+        Args:
+            total: Amount of items to sample.
+
+        Returns:
+            list: Randomly sampled repositories.
+        """
+        count = self.count_items()
+        if self.max_results:
+            count = min(count, self.max_results)
+
+        pages: dict[int, list[int]] = {}
+        for index in random.sample(range(count), min(total, count)):
+            page, offset = divmod(index, self.PER_PAGE)
+            pages.setdefault(page + 1, []).append(offset)
+
+        items: list[str] = []
+        for page, offsets in pages.items():
+            log.debug("Requesting sampled GH items page: %s", page)
+            response = self.request(self.format_url(page))
+            if not response:
+                continue
+            items.extend(
+                response[offset]["full_name"]
+                for offset in offsets
+                if offset < len(response)
+            )
+
+        return items
+
+    def request(
+        self,
+        url: str,
+        *,
+        retry: bool = True,
+        strict: bool = True,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        response = self.fetch(url, retry=retry, strict=strict, timeout=timeout)
+        if response is None:
+            return None
+        return response.json()
+
+    def fetch(
+        self,
+        url: str,
+        *,
+        retry: bool = True,
+        strict: bool = True,
+        timeout: Optional[float] = None,
+    ) -> Response | None:
+        """Fetches a raw response from the API.
+
+        Args:
+            url: Endpoint relative to the API base URL.
+            retry: Whether to retry once after a server error.
+            strict: Whether failed requests are critical and raise. Otherwise
+                they are logged at debug level and None is returned.
+            timeout: Optional timeout overriding the client default.
+
+        Returns:
+            Response | None: Successful response or None if rate limited or
+                not strict.
+        """
+        token = self.tokens.select()
+        headers = {"Authorization": f"Bearer {token}"} if token else None
+        response = self.client.get(
+            url,
+            headers=headers,
+            timeout=USE_CLIENT_DEFAULT if timeout is None else timeout,
+        )
+        if token is not None:
+            self.tokens.update(token, response.headers)
+        self.requests += 1
+        self.received += len(response.content)
+        if self.stats is not None:
+            self.stats.record_request(self.stats_key, len(response.content))
 
         if response.status_code != codes.OK:
             if retry and response.status_code == codes.INTERNAL_SERVER_ERROR:
@@ -133,12 +328,24 @@ class GithubAPI(ABC):
                     seconds,
                 )
                 time.sleep(seconds)
-                return self.request(url, retry=False)
+                return self.fetch(url, retry=False, strict=strict, timeout=timeout)
 
             if (
                 response.status_code == codes.TOO_MANY_REQUESTS
                 or "rate limit exceeded" in response.text
             ):
+                if self.stats is not None:
+                    self.stats.record_rate_limit(self.stats_key)
+                if token is not None:
+                    self.tokens.exhaust(token)
+                    if self.tokens.available():
+                        log.warning("Rate limit exceeded. Switching tokens.")
+                        return self.fetch(
+                            url,
+                            retry=retry,
+                            strict=strict,
+                            timeout=timeout,
+                        )
                 log.error(
                     "Rate limit exceeded. Stopping requests. %s",
                     response.text,
@@ -146,20 +353,29 @@ class GithubAPI(ABC):
                 return None
 
             err = "Connection failed to get items for url %s. Status Code: %s"
+            if not strict:
+                log.debug(err, url, response.status_code)
+                return None
             log.critical(err, url, response.status_code)
             response.raise_for_status()
 
-        return response.json()
+        return response
 
     def load_items(self) -> dict[str, Any] | None:
-        cache_path = self.cache_path / Path(
-            self.CACHE_PATH.format(account=self.account)
-        )
+        cache_path = self.cache_file
         if not cache_path.exists():
             return None
 
-        with cache_path.open("r", encoding="utf-8") as file:
-            cache_data = json.load(file)
+        try:
+            cache_data = SERIALIZER.decode_cache(cache_path.read_bytes())
+        except SerializationError as err:
+            log.warning("Cache is invalid and will be refreshed: %s", err)
+            return None
+
+        cache_format = cache_data.get("format", 1)
+        if cache_format < CACHE_FORMAT:
+            log.warning("Cache uses an older format and will be refreshed.")
+            return None
 
         log.info(
             "Cache last refreshed on the %s.",
@@ -174,12 +390,50 @@ class GithubAPI(ABC):
                 version,
             )
 
-        return self.save_items(cache_data.get("data", []), cache_data)
+        if self.index is not None:
+            self.index.touch(cache_path, self.account, str(version), cache_format)
+            self.index.save()
+
+        return dict(cache_data)
+
+    def recover_items(self) -> dict[str, Any] | None:
+        """Recovers the user lists of a cache that failed validation.
+
+        Returns:
+            dict | None: Container with the ignore and history lists that
+                still decode or None if there is no cache file.
+        """
+        if not self.cache_file.exists():
+            return None
+
+        try:
+            cache_data = SERIALIZER.decode(self.cache_file.read_bytes())
+        except SerializationError:
+            cache_data = None
+        if not isinstance(cache_data, dict):
+            cache_data = {}
+
+        container = {
+            key: value
+            for key, value in cache_data.items()
+            if key not in {"data", "ignore", "history", "probe"}
+        }
+        for key in ("ignore", "history"):
+            value = cache_data.get(key)
+            if isinstance(value, list) and all(isinstance(i, str) for i in value):
+                container[key] = value
+            else:
+                log.warning("Cached %s list could not be recovered and was reset.", key)
+                container[key] = []
+
+        return container
 
     def save_items(
         self,
         data: set[str],
         container: Optional[dict] = None,
+        *,
+        probe: Optional[dict[str, Any]] = None,
     ) -> dict[str, Any]:
         """Formats saves cached items to a json file.
 
@@ -189,12 +443,11 @@ class GithubAPI(ABC):
             data: A set of repositories.
             container: A dictionary with all the data needed to run the main
                 script.
+            probe: Fingerprint of the items to compare future refreshes with.
         Returns:
             dict: A dictionary with all the data needed to run the main script.
         """
-        cache_path = self.cache_path / Path(
-            self.CACHE_PATH.format(account=self.account)
-        )
+        cache_path = self.cache_file
 
         if container is None:
             container = {
@@ -206,20 +459,48 @@ class GithubAPI(ABC):
             container["data"] = list(data)
 
         container["version"] = __version__
+        container["format"] = CACHE_FORMAT
         container["date"] = datetime.now().isoformat()
         container["account"] = self.account
+        if probe is not None:
+            container["probe"] = probe
 
-        with cache_path.open("w", encoding="utf-8") as file:
-            json.dump(container, file)
+        cache_path.write_bytes(SERIALIZER.encode(container))
+        if self.index is not None:
+            self.index.touch(cache_path, self.account, __version__)
+            self.index.save()
 
         return container
 
 
 class GHStars(GithubAPI):
-    USER_PARAMS = GithubAPI.USER_PARAMS + "starred?page={page}&per_page=30"
+    NAME = "star"
+    USER_PARAMS = GithubAPI.USER_PARAMS + "starred?page={page}&per_page={per_page}"
     CACHE_PATH = "{account}_cache.json"
 
+    def probe(self) -> dict[str, Any] | None:
+        response = self.fetch(self.format_url(1, per_page=1))
+        if response is None:
+            return None
+
+        items = response.json()
+        return {
+            "count": self._count(response),
+            "newest": items[0]["full_name"] if items else None,
+        }
+
 
 class GHRepos(GithubAPI):
-    USER_PARAMS = GithubAPI.USER_PARAMS + "repos?page={page}&per_page=30"
+    NAME = "repo"
+    USER_PARAMS = GithubAPI.USER_PARAMS + "repos?page={page}&per_page={per_page}"
     CACHE_PATH = "{account}_repo_cache.json"
+
+    def probe(self) -> dict[str, Any] | None:
+        response = self.request(GithubAPI.USER_PARAMS.format(user=self.account))
+        if not response:
+            return None
+
+        return {
+            "count": response["public_repos"],
+            "newest": response["updated_at"],
+        }
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Collection
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Final
+
+from github_random_star.serializer import (
+    CACHE_FORMAT,
+    SERIALIZER,
+    SerializationError,
+)
+
+log = logging.getLogger("github-random-star")
+
+
+class CacheIndex:
+    """Small index of the account caches stored in the cache directory.
+
+    Tracks size, version, format and last access of every cache file, so
+    housekeeping never has to scan or parse the caches themselves. The
+    directory is only scanned once to build the index when it does not exist
+    yet.
+
+    Collected caches are trimmed down to their ignore and history lists
+    instead of being deleted, so the items are crawled again on the next run
+    without losing any user choices.
+
+    Methods:
+        load: Loads the stored index.
+        save: Saves the index to the cache directory.
+        touch: Records an access of a cache file.
+        remove: Deletes a cache file and its entry.
+        trim: Drops the items of a cache while keeping its user lists.
+        entries: Lists all entries from least to most recently used.
+        collect: Trims incompatible caches and caches over budget.
+        rebuild: Recreates the index by scanning the cache directory.
+        budget: Reads the disk budget from the environment.
+
+    Attributes:
+        FILE_NAME: Name of the index file inside the cache directory.
+        CACHE_GLOB: Pattern matching every account cache file.
+        DEFAULT_BUDGET: Disk budget in bytes used when none is configured.
+        cache_location: Path to the cache directory.
+        path: Path to the index file.
+        data: Entries keyed by cache file name.
+    """
+
+    FILE_NAME: Final[str] = "index.json"
+    CACHE_GLOB: Final[str] = "*_cache.json"
+    DEFAULT_BUDGET: Final[int] = 50 * 1024**2
+
+    __slots__ = ("cache_location", "data", "path")
+
+    def __init__(self, cache_location: Path) -> None:
+        self.cache_location = cache_location
+        self.path = cache_location / Path(self.FILE_NAME)
+        if self.path.exists():
+            self.data = self.load()
+        else:
+            self.rebuild()
+            self.save()
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        try:
+            return SERIALIZER.decode(self.path.read_bytes())
+        except SerializationError:
+            log.warning("Cache index is corrupted. Run `gh-star cache --rebuild`.")
+            return {}
+
+    def save(self) -> None:
+        self.path.write_bytes(SERIALIZER.encode(self.data))
+
+    def touch(
+        self,
+        file: Path,
+        account: str,
+        version: str,
+        cache_format: int = CACHE_FORMAT,
+    ) -> None:
+        self.data[file.name] = {
+            "account": account,
+            "version": version,
+            "format": cache_format,
+            "size": file.stat().st_size,
+            "accessed": datetime.now().isoformat(),
+        }
+
+    def remove(self, name: str) -> None:
+        log.info("Removing cache %s.", name)
+        (self.cache_location / Path(name)).unlink(missing_ok=True)
+        self.data.pop(name, None)
+
+    def trim(self, name: str) -> None:
+        """Drops the items and probe of a cache while keeping its user lists.
+
+        The trimmed cache fails validation when loaded, so the items are
+        crawled again and the ignore and history lists are recovered.
+
+        Args:
+            name: File name of the cache to trim.
+        """
+        file = self.cache_location / Path(name)
+        try:
+            cache = SERIALIZER.decode(file.read_bytes())
+        except (OSError, SerializationError):
+            cache = None
+        if not isinstance(cache, dict):
+            self.remove(name)
+            return
+
+        log.info("Trimming cache %s.", name)
+        cache.pop("data", None)
+        cache.pop("probe", None)
+        file.write_bytes(SERIALIZER.encode(cache))
+        self.data[name].update(size=file.stat().st_size, trimmed=True)
+
+    def entries(self) -> list[tuple[str, dict[str, Any]]]:
+        return sorted(self.data.items(), key=lambda item: item[1]["accessed"])
+
+    def collect(self, budget: int, keep: Collection[str] = ()) -> list[str]:
+        """Trims incompatible caches and the least recently used ones.
+
+        Caches are incompatible when written in an older cache format. Caches
+        that are already trimmed are skipped.
+
+        Args:
+            budget: Maximum total size of all caches in bytes.
+            keep: Cache file names that should never be trimmed.
+
+        Returns:
+            list: Names of the trimmed cache files.
+        """
+        trimmed = []
+        for name, entry in self.entries():
+            if name in keep or entry.get("trimmed"):
+                continue
+            if entry.get("format", 1) >= CACHE_FORMAT:
+                continue
+            self.trim(name)
+            trimmed.append(name)
+
+        total = sum(entry["size"] for entry in self.data.values())
+        for name, entry in self.entries():
+            if total <= budget:
+                break
+            if name in keep or entry.get("trimmed"):
+                continue
+            total -= entry["size"]
+            self.trim(name)
+            total += self.data.get(name, {}).get("size", 0)
+            trimmed.append(name)
+
+        return trimmed
+
+    def rebuild(self) -> None:
+        """Recreates the index from the cache files on disk."""
+        self.data = {}
+        for file in self.cache_location.glob(self.CACHE_GLOB):
+            try:
+                cache = SERIALIZER.decode(file.read_bytes())
+            except SerializationError:
+                cache = None
+            if not isinstance(cache, dict):
+                cache = {"data": None}
+
+            stat = file.stat()
+            self.data[file.name] = {
+                "account": file.name.split("_")[0],
+                "version": cache.get("version", "0.0.0"),
+                "format": cache.get("format", 1),
+                "size": stat.st_size,
+                "accessed": datetime.fromtimestamp(stat.st_atime).isoformat(),
+                "trimmed": "data" not in cache,
+            }
+
+    @classmethod
+    def budget(cls) -> int:
+        env = os.environ.get("GH_STAR_CACHE_BUDGET")
+        if env is None:
+            return cls.DEFAULT_BUDGET
+        return int(float(env) * 1024**2)
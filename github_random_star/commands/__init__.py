@@ -1,4 +1,6 @@
 from .star import StarCommand
 from .repo import RepoCommand
+from .stats import StatsCommand
+from .cache import CacheCommand
 
-__all__ = ("StarCommand", "RepoCommand")
+__all__ = ("StarCommand", "RepoCommand", "StatsCommand", "CacheCommand")
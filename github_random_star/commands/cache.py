@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from cleo.commands.command import Command
+from cleo.helpers import option
+
+from github_random_star.cache import CacheIndex
+from github_random_star.utility import generate_cache_directory
+
+
+class CacheCommand(Command):
+    name = "cache"
+    description = "List cached accounts and keep the cache directory within its budget."
+
+    options = [
+        option(
+            "gc",
+            description="Trim caches of an older format and the least recently used ones over budget down to their ignore and history lists.",
+        ),
+        option(
+            "budget",
+            description="Disk budget in MiB. GH_STAR_CACHE_BUDGET environment variable can be used to override this value. Defaults to 50.",
+            flag=False,
+            value_required=False,
+        ),
+        option(
+            "rebuild",
+            description="Recreate the cache index by scanning the cache directory.",
+        ),
+    ]
+
+    def handle(self) -> int:
+        index = CacheIndex(generate_cache_directory())
+
+        if self.option("rebuild"):
+            index.rebuild()
+            self.line(f"Indexed {len(index.data)} caches.", style="info")
+
+        if self.option("gc"):
+            budget = self.option("budget")
+            if budget is None:
+                budget = CacheIndex.budget()
+            else:
+                budget = int(float(budget) * 1024**2)
+            for name in index.collect(budget):
+                self.line(f"Trimmed cache {name}", style="comment")
+
+        if self.option("rebuild") or self.option("gc"):
+            index.save()
+
+        entries = index.entries()
+        if not entries:
+            self.line("No caches indexed yet.", style="comment")
+            return 0
+
+        now = datetime.now()
+        total = 0
+        for name, entry in reversed(entries):
+            total += entry["size"]
+            age = now - datetime.fromisoformat(entry["accessed"])
+            trimmed = "  trimmed" if entry.get("trimmed") else ""
+            self.line(
+                f"{entry['account']:<24} {name:<40} "
+                f"{entry['size'] / 1024:>10.1f} KiB "
+                f"{age.days:>5}d ago  v{entry['version']}{trimmed}"
+            )
+        self.line(f"Total: {total / 1024:.1f} KiB", style="info")
+
+        return 0
@@ -5,6 +5,7 @@ import os
 import random
 from typing import Any, Final
 import subprocess
+import time
 from pathlib import Path
 
 from cleo.commands.command import Command
@@ -12,7 +13,11 @@ from cleo.helpers import option, argument
 from cleo.io.outputs.output import Verbosity
 
 from github_random_star.api import GithubAPI
-from github_random_star.utility import generate_cache_directory
+from github_random_star.cache import CacheIndex
+from github_random_star.details import RepoDetails
+from github_random_star.stats import PerformanceStats
+from github_random_star.tokens import TokenPool
+from github_random_star.utility import NoCandidatesError, generate_cache_directory
 
 
 class BaseCommand(Command):
@@ -37,7 +42,11 @@ class BaseCommand(Command):
         option(
             "refresh",
             "r",
-            "Whether to fetch new cached data or not. Will re-fetch all repositories instead of using cache.",
+            "Whether to fetch new cached data or not. Will re-fetch all repositories instead of using cache, unless a quick probe reports no changes.",
+        ),
+        option(
+            "force",
+            description="Refresh even if the probe reports no changes.",
         ),
         option(
             "max_history",
@@ -58,6 +67,14 @@ class BaseCommand(Command):
             flag=False,
             default=0,
         ),
+        option(
+            "quick",
+            description="Pick from a few randomly sampled pages instead of crawling every page when no cache exists yet. Quick picks are not cached.",
+        ),
+        option(
+            "no_details",
+            description="Skip fetching the description, language, stars and last push of the shown repositories.",
+        ),
     ]
 
     def option(self, name: str) -> Any:
@@ -69,16 +86,57 @@ class BaseCommand(Command):
 
     def handle(self) -> int:
         """Basic entrypoint for the CLI script."""
+        start = time.perf_counter()
         cache_path = generate_cache_directory()
+        stats = PerformanceStats(cache_path)
 
         github_api = self.API(
             self.argument("account"),
             cache_path,
             refresh=self.option("refresh"),
-            max_results=self.option("max_results"),
-            token=os.environ.get("GITHUB_ACCESS_TOKEN"),
+            force=self.option("force"),
+            max_results=int(self.option("max_results")),
+            tokens=TokenPool.from_env(),
+            stats=stats,
+            index=CacheIndex(cache_path),
         )
-        repositories = github_api.collect_items()
+        try:
+            return self.run_selection(github_api, cache_path, start)
+        finally:
+            stats.save()
+            self.housekeeping(github_api)
+
+    def run_selection(
+        self,
+        github_api: GithubAPI,
+        cache_path: Path,
+        start: float,
+    ) -> int:
+        """Collects the repositories and lets the user pick one.
+
+        Args:
+            github_api: API instance used to collect the repositories.
+            cache_path: Path to the cache directory.
+            start: Performance counter value when the command started.
+
+        Returns:
+            int: Exit code of the command.
+        """
+        quick = self.option("quick") and not github_api.cache_file.exists()
+        if quick:
+            repositories = self.quick_items(github_api)
+        else:
+            repositories = github_api.collect_items()
+
+        if github_api.stats is not None:
+            github_api.stats.record_pick(
+                github_api.stats_key,
+                time.perf_counter() - start,
+            )
+
+        if not repositories["data"]:
+            self.line("No repositories found.", style="error")
+            return 1
 
         self.line(
             f"Total amount of repositories: {len(repositories['data'])}",
@@ -89,14 +147,69 @@ class BaseCommand(Command):
             verbosity=Verbosity.VERBOSE,
         )
 
-        data = self.item_selection(repositories, cache_path)
+        details = None
+        if not self.option("no_details"):
+            details = RepoDetails(github_api, cache_path)
+        try:
+            data = self.item_selection(
+                repositories,
+                cache_path,
+                details,
+                persist=not quick,
+            )
+        except NoCandidatesError:
+            self.line(
+                "Every repository is ignored. Run with --ignore to include them.",
+                style="error",
+            )
+            return 1
+        finally:
+            if details is not None:
+                details.close()
 
-        github_api.save_items(data["data"], data)
+        if quick:
+            self.line(
+                "Quick pick used. Run without --quick to cache all repositories.",
+                style="comment",
+                verbosity=Verbosity.VERBOSE,
+            )
+        else:
+            github_api.save_items(data["data"], data)
 
         self.line("Done!", style="info")
 
         return 0
 
+    def housekeeping(self, github_api: GithubAPI) -> None:
+        """Keeps the cache directory within its disk budget.
+
+        Args:
+            github_api: API instance whose cache was just used.
+        """
+        if github_api.index is None:
+            return
+
+        trimmed = github_api.index.collect(
+            CacheIndex.budget(),
+            keep={github_api.cache_file.name},
+        )
+        for name in trimmed:
+            self.line(f"Trimmed cache {name}", verbosity=Verbosity.VERBOSE)
+        if trimmed:
+            github_api.index.save()
+
+    def quick_items(self, github_api: GithubAPI) -> dict[str, Any]:
+        """Samples items without crawling or caching every page.
+
+        Args:
+            github_api: API instance used to sample the items.
+
+        Returns:
+            dict: A cache like container with only the sampled items.
+        """
+        items = github_api.sample_items(int(self.option("total")))
+        return {"data": items, "ignore": [], "history": []}
+
     @staticmethod
     def extract_selection(path: Path) -> list[str]:
         """Extracts selections from JSON file.
@@ -121,32 +234,56 @@ class BaseCommand(Command):
     def user_selection(
         self,
         raw_items: set[str],
+        details: RepoDetails | None = None,
     ) -> tuple[str, float]:
         """Selection function where the user chooses a random repository.
 
         Args:
             starred_items: Set of starred items from GitHub.
+            details: Optional details cache for the candidates. Details are
+                shown once they arrived whenever the candidates are printed,
+                so the prompt is never overwritten.
 
         Returns:
             tuple[str, float]: Selected item and the selection number for
                 further processing
 
         """
-        total = self.option("total")
+        total = min(int(self.option("total")), len(raw_items))
         items = random.sample(tuple(raw_items), total)
 
+        descriptions: dict[str, str] = {}
+
+        def show(name: str, info: dict[str, Any]) -> None:
+            descriptions[name] = RepoDetails.format(info)
+
+        if details is not None:
+            details.prefetch(items, show)
+
         self.line("Which repository would you like to view today?", style="question")
         self.line(
             "Note: Add .1 to number to add to ignore list",
             style="info",
             verbosity=Verbosity.NORMAL,
         )
+        if details is not None:
+            self.line(
+                "Note: Press enter to show details that arrived since",
+                style="info",
+                verbosity=Verbosity.NORMAL,
+            )
         while True:
             for i, star in enumerate(items, start=1):
-                print(f"{i}. {star}")
-
+                if star in descriptions:
+                    print(f"{i}. {star} - {descriptions[star]}")
+                else:
+                    print(f"{i}. {star}")
+
+            answer = input("> ")
+            if details is not None and not str(answer).strip():
+                continue
             try:
-                selection = float(input("> "))
+                selection = float(answer)
                 if int(selection - 1) in range(total):
                     break
             except ValueError:
@@ -189,12 +326,24 @@ class BaseCommand(Command):
 
         return items
 
-    def item_selection(self, data: dict, cache_path: Path) -> dict[str, Any]:
+    def item_selection(
+        self,
+        data: dict,
+        cache_path: Path,
+        details: RepoDetails | None = None,
+        *,
+        persist: bool = True,
+    ) -> dict[str, Any]:
         """Selection function where the user chooses a repository.
 
         Args:
             items: Set of items from GitHub.
             cache_path: Path to the cache directory.
+            details: Optional details cache for the shown candidates.
+            persist: Whether the selection will be saved to the cache.
+
+        Raises:
+            NoCandidatesError: If every repository was filtered out.
 
         Returns:
             dict: A dictionary with all the data to be cached to the JSON file.
@@ -202,14 +351,23 @@ class BaseCommand(Command):
 
         max_history = self.option("max_history")
         items = self._filter_data(data, max_history)
+        if not items:
+            raise NoCandidatesError
 
-        selected_item, selection = self.user_selection(items)
+        selected_item, selection = self.user_selection(items, details)
 
         self.open_url(selected_item)
 
         if round(selection % 1, 1) == 0.1:
-            self.line(f"Adding {selected_item} to ignore list", style="info")
-            data["ignore"].append(selected_item)
+            if persist:
+                self.line(f"Adding {selected_item} to ignore list", style="info")
+                data["ignore"].append(selected_item)
+            else:
+                self.line(
+                    f"Quick picks are not cached, so {selected_item} was not "
+                    "added to the ignore list.",
+                    style="comment",
+                )
 
         data["history"].insert(0, selected_item)
         if len(data["history"]) > max_history and max_history > 0:
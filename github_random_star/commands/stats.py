@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+
+from cleo.commands.command import Command
+from cleo.helpers import argument, option
+
+from github_random_star.stats import PerformanceStats
+from github_random_star.utility import generate_cache_directory
+
+
+class StatsCommand(Command):
+    name = "stats"
+    description = "Summarize cumulative performance statistics of past runs."
+
+    arguments = [
+        argument(
+            "account",
+            description="Limit the summary to a single account.",
+            optional=True,
+        )
+    ]
+    options = [
+        option(
+            "json",
+            "j",
+            "Output the summary as JSON.",
+        ),
+    ]
+
+    def handle(self) -> int:
+        stats = PerformanceStats(generate_cache_directory())
+        summary = stats.summary()
+
+        account = self.argument("account")
+        if account:
+            summary = {
+                key: value
+                for key, value in summary.items()
+                if key.split(":", 1)[1] == account
+            }
+
+        if self.option("json"):
+            self.line(json.dumps(summary, indent=2))
+            return 0
+
+        if not summary:
+            self.line("No statistics recorded yet.", style="comment")
+            return 0
+
+        for key, values in summary.items():
+            self.line(key, style="info")
+            self.line(
+                f"  Cache hit ratio: {values['cache_hit_ratio']:.0%} "
+                f"- Picks: {values['picks']} "
+                f"- Mean pick latency: {values['mean_pick_seconds']:.2f}s"
+            )
+            self.line(
+                f"  Requests: {values['requests']} "
+                f"- Received: {values['bytes'] / 1024:.1f} KiB "
+                f"- Rate limited: {values['rate_limited']}"
+            )
+            self.line(
+                f"  Refreshes: {values['refreshes']} "
+                f"- Requests per refresh: {values['requests_per_refresh']:.1f} "
+                f"- KiB per refresh: {values['bytes_per_refresh'] / 1024:.1f} "
+                f"- Mean crawl: {values['mean_crawl_seconds']:.2f}s"
+            )
+            histogram = ", ".join(
+                f"{label}: {count}"
+                for label, count in values["crawl_latency"].items()
+                if count
+            )
+            if histogram:
+                self.line(f"  Crawl latency: {histogram}")
+
+        return 0
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Final
+
+from httpx import HTTPError
+
+from github_random_star.api import GithubAPI
+from github_random_star.serializer import SERIALIZER, SerializationError
+
+log = logging.getLogger("github-random-star")
+
+
+class RepoDetails:
+    """Concurrently fetches and caches details of individual repositories.
+
+    Details are shared between all accounts and commands, so a repository is
+    only requested again once its entry is older than the TTL. Requests run
+    on daemon threads, so closing never waits on the network and the process
+    exits right after the user picks.
+
+    Methods:
+        load: Loads the stored details.
+        save: Saves the details to the cache directory.
+        cached: Returns the details of a repository if they are still fresh.
+        fetch: Requests the details of a repository from the API.
+        prefetch: Fetches details in the background and reports them.
+        work: Worker loop fetching queued repositories.
+        close: Stops outstanding requests and saves the arrived details.
+        format: Formats details into a short single line.
+
+    Attributes:
+        FILE_NAME: Name of the details file inside the cache directory.
+        TTL: How long details are considered fresh.
+        TIMEOUT: Timeout in seconds of a single details request.
+        WORKERS: Maximum amount of concurrent requests.
+        github_api: API instance used to request the details.
+        path: Path to the details file.
+        data: Raw details keyed by repository name.
+        queue: Repositories waiting to be fetched with their callbacks.
+        workers: Daemon threads running the background requests.
+        closed: Set once the details are closed and saved.
+        lock: Guards the details while they are updated from worker threads.
+    """
+
+    FILE_NAME: Final[str] = "repo_details.json"
+    TTL: Final[timedelta] = timedelta(days=7)
+    WORKERS: Final[int] = 4
+    TIMEOUT: Final[float] = 5
+
+    __slots__ = ("closed", "data", "github_api", "lock", "path", "queue", "workers")
+
+    def __init__(self, github_api: GithubAPI, cache_location: Path) -> None:
+        self.github_api = github_api
+        self.path = cache_location / Path(self.FILE_NAME)
+        self.data = self.load()
+        self.queue: queue.Queue[tuple[str, Callable[..., None]]] = queue.Queue()
+        self.workers: list[threading.Thread] = []
+        self.closed = threading.Event()
+        self.lock = threading.Lock()
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+
+        try:
+            return SERIALIZER.decode(self.path.read_bytes())
+        except SerializationError:
+            log.warning("Repository details cache is corrupted. Starting over.")
+            return {}
+
+    def save(self) -> None:
+        expiry = (datetime.now() - self.TTL).isoformat()
+        with self.lock:
+            data = {
+                name: details
+                for name, details in self.data.items()
+                if details["fetched"] > expiry
+            }
+        self.path.write_bytes(SERIALIZER.encode(data))
+
+    def cached(self, name: str) -> dict[str, Any] | None:
+        details = self.data.get(name)
+        if details is None:
+            return None
+        if datetime.fromisoformat(details["fetched"]) + self.TTL < datetime.now():
+            return None
+        return details
+
+    def fetch(self, name: str) -> dict[str, Any] | None:
+        try:
+            response = self.github_api.request(
+                f"repos/{name}",
+                retry=False,
+                strict=False,
+                timeout=self.TIMEOUT,
+            )
+        except HTTPError as err:
+            log.debug("Failed to fetch details for %s: %s", name, err)
+            return None
+
+        if not response:
+            return None
+
+        details = {
+            "description": response.get("description"),
+            "language": response.get("language"),
+            "stars": response.get("stargazers_count", 0),
+            "pushed_at": response.get("pushed_at"),
+            "fetched": datetime.now().isoformat(),
+        }
+        with self.lock:
+            self.data[name] = details
+
+        return details
+
+    def prefetch(
+        self,
+        names: Iterable[str],
+        callback: Callable[[str, dict[str, Any]], None],
+    ) -> None:
+        """Reports details of each repository as soon as they are available.
+
+        Fresh cached details are reported immediately, while the rest are
+        requested concurrently in the background.
+
+        Args:
+            names: Repositories to fetch the details of.
+            callback: Called with the repository and its details. Might be
+                called from a worker thread.
+        """
+        for name in names:
+            details = self.cached(name)
+            if details is not None:
+                callback(name, details)
+                continue
+
+            self.queue.put((name, callback))
+            if len(self.workers) < self.WORKERS:
+                worker = threading.Thread(target=self.work, daemon=True)
+                worker.start()
+                self.workers.append(worker)
+
+    def work(self) -> None:
+        while True:
+            name, callback = self.queue.get()
+            try:
+                if self.closed.is_set():
+                    continue
+
+                details = self.fetch(name)
+                if details is None:
+                    continue
+                if self.closed.is_set():
+                    log.debug("Details for %s arrived after closing.", name)
+                    continue
+
+                callback(name, details)
+            except Exception:
+                log.debug("Failed to report details for %s.", name, exc_info=True)
+            finally:
+                self.queue.task_done()
+
+    def close(self, *, wait: bool = False) -> None:
+        """Stops outstanding requests and saves the details that arrived.
+
+        Requests still running are abandoned and their details are neither
+        reported nor saved.
+
+        Args:
+            wait: Whether to wait for every queued request before saving.
+        """
+        if wait:
+            self.queue.join()
+        self.closed.set()
+        self.save()
+
+    @staticmethod
+    def format(details: dict[str, Any]) -> str:
+        parts = []
+        if details["language"]:
+            parts.append(details["language"])
+        parts.append(f"★ {details['stars']}")
+        if details["pushed_at"]:
+            pushed = datetime.fromisoformat(details["pushed_at"].replace("Z", ""))
+            parts.append(f"pushed {pushed.date().isoformat()}")
+
+        description = details["description"] or ""
+        if len(description) > 60:
+            description = description[:57] + "..."
+
+        summary = " · ".join(parts)
+        return f"{description} ({summary})" if description else summary
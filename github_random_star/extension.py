@@ -4,7 +4,12 @@ import logging
 from cleo.application import Application
 from cleo.io.inputs.string_input import StringInput
 
-from github_random_star.commands import StarCommand, RepoCommand
+from github_random_star.commands import (
+    StarCommand,
+    RepoCommand,
+    StatsCommand,
+    CacheCommand,
+)
 from github_random_star.version import __version__
 
 from .utility import setup_logging
@@ -18,6 +23,8 @@ def run(args=None) -> int:
     )
     app.add(StarCommand())
     app.add(RepoCommand())
+    app.add(StatsCommand())
+    app.add(CacheCommand())
 
     try:
         if args:
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import json
+import logging
+import types
+from typing import (
+    Any,
+    Final,
+    TypedDict,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+    is_typeddict,
+)
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None  # type: ignore[assignment]
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+log = logging.getLogger("github-random-star")
+
+
+# Layout version of the account caches, only bumped on incompatible changes.
+# Caches without a format field use the original layout of format 1.
+CACHE_FORMAT: Final[int] = 1
+
+
+class SerializationError(ValueError):
+    "Data could not be decoded or does not match the cache schema."
+
+
+class ProbeData(TypedDict):
+    """Fingerprint used to detect changes without a full refresh."""
+
+    count: int
+    newest: str | None
+
+
+class _CacheRequired(TypedDict):
+    data: list[str]
+    ignore: list[str]
+    history: list[str]
+    date: str
+
+
+class CacheData(_CacheRequired, total=False):
+    """Schema of the account cache files.
+
+    Unknown fields are kept as is, so caches from newer versions survive.
+    """
+
+    version: str
+    format: int
+    account: str
+    probe: ProbeData
+
+
+_CACHE_FIELDS: Final[dict[str, Any]] = get_type_hints(CacheData)
+
+
+def _matches(value: Any, kind: Any) -> bool:
+    """Checks a decoded value against a type of the cache schema."""
+    if kind is type(None):
+        return value is None
+    if is_typeddict(kind):
+        if not isinstance(value, dict) or not kind.__required_keys__ <= value.keys():
+            return False
+        return all(
+            _matches(value[key], field)
+            for key, field in get_type_hints(kind).items()
+            if key in value
+        )
+
+    origin = get_origin(kind)
+    if origin in (Union, types.UnionType):
+        return any(_matches(value, arg) for arg in get_args(kind))
+    if origin is list:
+        (item,) = get_args(kind)
+        if not isinstance(value, list):
+            return False
+        if item is str:
+            return all(isinstance(i, str) for i in value)
+        return all(_matches(i, item) for i in value)
+    if kind is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    return isinstance(value, kind)
+
+
+class JSONSerializer:
+    """Standard library serializer used when no faster backend is installed.
+
+    Methods:
+        encode: Encodes any JSON compatible object.
+        decode: Decodes any JSON document.
+        decode_cache: Decodes and validates an account cache.
+
+    Attributes:
+        NAME: Name of the serializer backend.
+    """
+
+    NAME: str = "json"
+
+    __slots__ = ()
+
+    def encode(self, obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def decode(self, raw: bytes) -> Any:
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError as err:
+            raise SerializationError(str(err)) from err
+
+    def decode_cache(self, raw: bytes) -> CacheData:
+        """Decodes an account cache while checking it against the schema.
+
+        Args:
+            raw: Encoded cache file contents.
+
+        Raises:
+            SerializationError: If the data is malformed or does not match
+                the cache schema.
+
+        Returns:
+            CacheData: Decoded cache container.
+        """
+        data = self.decode(raw)
+        if not isinstance(data, dict):
+            msg = "Cache root is not an object."
+            raise SerializationError(msg)
+
+        for key, kind in _CACHE_FIELDS.items():
+            if key not in data:
+                if key in CacheData.__required_keys__:
+                    msg = f"Cache is missing the required {key!r} field."
+                    raise SerializationError(msg)
+                continue
+
+            if not _matches(data[key], kind):
+                name = kind.__name__ if isinstance(kind, type) else kind
+                msg = f"Cache field {key!r} is not of type {name}."
+                raise SerializationError(msg)
+
+        return data  # type: ignore[return-value]
+
+
+class OrjsonSerializer(JSONSerializer):
+    """Serializer using `orjson` for faster encoding and decoding."""
+
+    NAME = "orjson"
+
+    __slots__ = ()
+
+    def encode(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def decode(self, raw: bytes) -> Any:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError as err:
+            raise SerializationError(str(err)) from err
+
+
+class MsgspecSerializer(JSONSerializer):
+    """Serializer using `msgspec` for faster encoding, decoding and validation.
+
+    Caches are decoded into plain objects and converted against the schema
+    afterwards, so fields unknown to this version survive a save.
+    """
+
+    NAME = "msgspec"
+
+    __slots__ = ("decoder", "encoder")
+
+    def __init__(self) -> None:
+        self.encoder = msgspec.json.Encoder()
+        self.decoder = msgspec.json.Decoder()
+
+    def encode(self, obj: Any) -> bytes:
+        return self.encoder.encode(obj)
+
+    def decode(self, raw: bytes) -> Any:
+        try:
+            return self.decoder.decode(raw)
+        except msgspec.DecodeError as err:
+            raise SerializationError(str(err)) from err
+
+    def decode_cache(self, raw: bytes) -> CacheData:
+        data = self.decode(raw)
+        try:
+            msgspec.convert(data, CacheData)
+        except msgspec.ValidationError as err:
+            raise SerializationError(str(err)) from err
+        return data
+
+
+def available_serializers() -> list[JSONSerializer]:
+    """Lists all usable serializers with the fastest one first."""
+    serializers: list[JSONSerializer] = []
+    if msgspec is not None:
+        serializers.append(MsgspecSerializer())
+    if orjson is not None:
+        serializers.append(OrjsonSerializer())
+    serializers.append(JSONSerializer())
+    return serializers
+
+
+SERIALIZER: Final[JSONSerializer] = available_serializers()[0]
+log.debug("Using %s for cache serialization.", SERIALIZER.NAME)
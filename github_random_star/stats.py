@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Final
+
+from github_random_star.serializer import SERIALIZER, SerializationError
+
+log = logging.getLogger("github-random-star")
+
+
+class PerformanceStats:
+    """Cumulative performance statistics stored in the cache directory.
+
+    Statistics are kept per account and command, so expensive accounts can be
+    identified across many invocations.
+
+    Methods:
+        load: Loads the stored statistics.
+        save: Saves the statistics to the cache directory.
+        record_cache: Records a cache hit or miss.
+        record_request: Records a single API request.
+        record_rate_limit: Records a rate limit exhaustion event.
+        record_refresh: Records a full crawl of an account.
+        record_pick: Records the time it took to present candidates.
+        summary: Summarizes the statistics of every account.
+
+    Attributes:
+        FILE_NAME: Name of the statistics file inside the cache directory.
+        LATENCY_BUCKETS: Upper bounds in seconds of the crawl latency
+            histogram. The last bucket collects everything above.
+        path: Path to the statistics file.
+        data: Raw statistics keyed by account.
+    """
+
+    FILE_NAME: Final[str] = "stats.json"
+    LATENCY_BUCKETS: Final[tuple[float, ...]] = (0.5, 1, 2, 5, 10, 30, 60, 120)
+
+    __slots__ = ("data", "path")
+
+    def __init__(self, cache_location: Path) -> None:
+        self.path = cache_location / Path(self.FILE_NAME)
+        self.data = self.load()
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+
+        try:
+            return SERIALIZER.decode(self.path.read_bytes())
+        except SerializationError:
+            log.warning("Statistics file is corrupted. Starting over.")
+            return {}
+
+    def save(self) -> None:
+        self.path.write_bytes(SERIALIZER.encode(self.data))
+
+    def _account(self, key: str) -> dict[str, Any]:
+        return self.data.setdefault(
+            key,
+            {
+                "cache_hits": 0,
+                "cache_misses": 0,
+                "requests": 0,
+                "bytes": 0,
+                "rate_limited": 0,
+                "refreshes": 0,
+                "refresh_requests": 0,
+                "refresh_bytes": 0,
+                "crawl_seconds": 0.0,
+                "crawl_latency": [0] * (len(self.LATENCY_BUCKETS) + 1),
+                "picks": 0,
+                "pick_seconds": 0.0,
+                "last_used": None,
+            },
+        )
+
+    def record_cache(self, key: str, *, hit: bool) -> None:
+        account = self._account(key)
+        account["cache_hits" if hit else "cache_misses"] += 1
+
+    def record_request(self, key: str, size: int) -> None:
+        account = self._account(key)
+        account["requests"] += 1
+        account["bytes"] += size
+
+    def record_rate_limit(self, key: str) -> None:
+        self._account(key)["rate_limited"] += 1
+
+    def record_refresh(
+        self,
+        key: str,
+        seconds: float,
+        requests: int,
+        size: int,
+    ) -> None:
+        account = self._account(key)
+        account["refreshes"] += 1
+        account["refresh_requests"] += requests
+        account["refresh_bytes"] += size
+        account["crawl_seconds"] += seconds
+
+        bucket = len(self.LATENCY_BUCKETS)
+        for i, bound in enumerate(self.LATENCY_BUCKETS):
+            if seconds <= bound:
+                bucket = i
+                break
+        account["crawl_latency"][bucket] += 1
+
+    def record_pick(self, key: str, seconds: float) -> None:
+        account = self._account(key)
+        account["picks"] += 1
+        account["pick_seconds"] += seconds
+        account["last_used"] = datetime.now().isoformat()
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Summarizes the raw statistics into averages and ratios.
+
+        Returns:
+            dict: Summary of each account sorted by total crawl time.
+        """
+        labels = [f"<={bound}s" for bound in self.LATENCY_BUCKETS]
+        labels.append(f">{self.LATENCY_BUCKETS[-1]}s")
+
+        summary = {}
+        for name, account in sorted(
+            self.data.items(),
+            key=lambda item: item[1]["crawl_seconds"],
+            reverse=True,
+        ):
+            lookups = account["cache_hits"] + account["cache_misses"]
+            refreshes = account["refreshes"]
+            summary[name] = {
+                "cache_hit_ratio": account["cache_hits"] / lookups if lookups else 0.0,
+                "requests": account["requests"],
+                "bytes": account["bytes"],
+                "rate_limited": account["rate_limited"],
+                "refreshes": refreshes,
+                "requests_per_refresh": (
+                    account["refresh_requests"] / refreshes if refreshes else 0.0
+                ),
+                "bytes_per_refresh": (
+                    account["refresh_bytes"] / refreshes if refreshes else 0.0
+                ),
+                "mean_crawl_seconds": (
+                    account["crawl_seconds"] / refreshes if refreshes else 0.0
+                ),
+                "crawl_latency": dict(zip(labels, account["crawl_latency"])),
+                "picks": account["picks"],
+                "mean_pick_seconds": (
+                    account["pick_seconds"] / account["picks"]
+                    if account["picks"]
+                    else 0.0
+                ),
+                "last_used": account["last_used"],
+            }
+
+        return summary
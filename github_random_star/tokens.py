@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from typing import Final
+
+log = logging.getLogger("github-random-star")
+
+
+class TokenPool:
+    """Pool of GitHub API tokens rotated by their remaining rate limit.
+
+    Remaining quota is tracked from the rate limit headers of each response
+    and requests always go to the token with the most budget left.
+
+    Methods:
+        select: Picks the token with the most remaining budget.
+        available: Whether any token still has budget left.
+        update: Updates the quota of a token from response headers.
+        exhaust: Marks a token as exhausted until its quota resets.
+        from_env: Creates a pool from the environment.
+
+    Attributes:
+        DEFAULT_LIMIT: Assumed quota of a token that has not been used yet.
+        quotas: Remaining requests and reset timestamp keyed by token.
+        lock: Guards the quotas while requests run concurrently.
+    """
+
+    DEFAULT_LIMIT: Final[int] = 5000
+
+    __slots__ = ("lock", "quotas")
+
+    def __init__(self, tokens: Iterable[str] = ()) -> None:
+        self.quotas: dict[str, tuple[int, float]] = {
+            token: (self.DEFAULT_LIMIT, 0.0) for token in dict.fromkeys(tokens) if token
+        }
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.quotas)
+
+    def _remaining(self, token: str, now: float) -> int:
+        remaining, reset = self.quotas[token]
+        if reset and reset <= now:
+            return self.DEFAULT_LIMIT
+        return remaining
+
+    def select(self) -> str | None:
+        """Picks the token with the most remaining budget.
+
+        Returns:
+            str | None: Best token or None if the pool is empty. When every
+                token is exhausted the one that resets first is returned.
+        """
+        if not self.quotas:
+            return None
+
+        now = time.time()
+        with self.lock:
+            if not self.available():
+                return min(self.quotas, key=lambda token: self.quotas[token][1])
+            return max(self.quotas, key=lambda token: self._remaining(token, now))
+
+    def available(self) -> bool:
+        now = time.time()
+        return any(self._remaining(token, now) > 0 for token in self.quotas)
+
+    def update(self, token: str, headers: Mapping[str, str]) -> None:
+        remaining = headers.get("x-ratelimit-remaining")
+        reset = headers.get("x-ratelimit-reset")
+        if remaining is None:
+            return
+        with self.lock:
+            self.quotas[token] = (int(remaining), float(reset or 0.0))
+
+    def exhaust(self, token: str) -> None:
+        now = time.time()
+        with self.lock:
+            reset = self.quotas[token][1]
+            if reset <= now:
+                reset = now + 60 * 60
+            self.quotas[token] = (0, reset)
+
+    @classmethod
+    def from_env(cls) -> TokenPool:
+        """Creates a pool from the GITHUB_ACCESS_TOKENS comma separated list
+        and the single GITHUB_ACCESS_TOKEN environment variables."""
+        tokens = os.environ.get("GITHUB_ACCESS_TOKENS", "").split(",")
+        tokens.append(os.environ.get("GITHUB_ACCESS_TOKEN", ""))
+        return cls(token.strip() for token in tokens)
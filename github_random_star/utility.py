@@ -9,6 +9,10 @@ class AccountMissingError(TypeError):
     "GitHub account was not provided through flags or an environment variable."
 
 
+class NoCandidatesError(ValueError):
+    "No repositories are left to pick from after filtering."
+
+
 def generate_cache_directory():
     """Setup for cache directory depending on the OS.
 
@@ -1,6 +1,9 @@
 import random
 import os
+import shutil
+from urllib.parse import parse_qs, urlparse
 
+import httpx
 import pytest
 from github_random_star.utility import generate_cache_directory
 from github_random_star.api import GHStars
@@ -34,3 +37,69 @@ def get_data(cache_location, set_user_settings):
 def set_seed():
     random.seed(0)
     yield
+
+
+@pytest.fixture
+def isolated_cache(tmp_path, monkeypatch, cache_location):
+    """Copies the fixture caches into the same relative location below
+    tmp_path, so CLI processes started in tmp_path use the copy as well."""
+    location = tmp_path / cache_location
+    location.mkdir(parents=True)
+    for file in cache_location.glob("*_cache.json"):
+        shutil.copy(file, location)
+
+    for module in ("meta", "stats", "cache"):
+        monkeypatch.setattr(
+            f"github_random_star.commands.{module}.generate_cache_directory",
+            lambda: location,
+        )
+    return location
+
+
+def mock_starred(total: int, calls: list[str]):
+    items = [{"full_name": f"owner/repo-{i}"} for i in range(total)]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        query = parse_qs(urlparse(str(request.url)).query)
+        page = int(query["page"][0])
+        per_page = int(query["per_page"][0])
+        last = -(-total // per_page)
+        headers = {}
+        if last > 1:
+            headers["Link"] = (
+                f'<{request.url.copy_merge_params({"page": last})}>; rel="last"'
+            )
+        start = (page - 1) * per_page
+        return httpx.Response(
+            200,
+            json=items[start : start + per_page],
+            headers=headers,
+        )
+
+    return handler
+
+
+@pytest.fixture
+def starred_handler():
+    return mock_starred
+
+
+@pytest.fixture
+def mocked_api(tmp_path):
+    """Creates APIs answered by a mock transport instead of the network.
+
+    Without a handler the account has `total` starred items and every
+    requested URL is recorded in the returned calls list.
+    """
+    calls: list[str] = []
+
+    def create(handler=None, *, total=30_000, account="ddkasa", **kwargs) -> GHStars:
+        gh_api = GHStars(account, tmp_path, **kwargs)
+        gh_api.client = httpx.Client(
+            transport=httpx.MockTransport(handler or mock_starred(total, calls)),
+            base_url=gh_api.API_BASE_URL,
+        )
+        return gh_api
+
+    return create, calls
@@ -0,0 +1,173 @@
+import json
+
+import httpx
+import pytest
+from github_random_star.cache import CacheIndex
+from github_random_star.details import RepoDetails
+from github_random_star.tokens import TokenPool
+
+
+@pytest.mark.unit
+def test_count_items(mocked_api):
+    create_api, calls = mocked_api
+    assert create_api().count_items() == 30_000
+    assert len(calls) == 1
+
+
+@pytest.mark.unit
+def test_sample_items(set_seed, mocked_api):
+    create_api, calls = mocked_api
+    gh_api = create_api()
+    items = gh_api.sample_items(3)
+
+    assert len(items) == 3
+    assert len(set(items)) == 3
+    assert len(calls) <= 4
+    assert not gh_api.cache_file.exists()
+
+
+@pytest.mark.unit
+def test_repo_details(tmp_path, mocked_api):
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("deleted"):
+            return httpx.Response(404)
+        return httpx.Response(
+            200,
+            json={
+                "description": "Random starred repositories.",
+                "language": "Python",
+                "stargazers_count": 5,
+                "pushed_at": "2024-06-12T15:51:09Z",
+            },
+        )
+
+    create_api, _ = mocked_api
+    gh_api = create_api(handler)
+    names = ["ddkasa/gh-random-star", "ddkasa/Aoe4bot"]
+
+    received: dict[str, str] = {}
+    details = RepoDetails(gh_api, tmp_path)
+    details.prefetch(names, lambda name, info: received.update({name: info}))
+    details.close(wait=True)
+
+    assert sorted(received) == sorted(names)
+    assert "Python" in RepoDetails.format(received[names[0]])
+    assert len(calls) == 2
+
+    details = RepoDetails(gh_api, tmp_path)
+    details.prefetch(names, lambda *_: None)
+    details.close()
+
+    assert len(calls) == 2
+    assert details.fetch("ddkasa/deleted") is None
+
+
+@pytest.mark.unit
+def test_token_rotation(mocked_api):
+    used: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        used.append(token)
+        if token == "first":
+            return httpx.Response(
+                403,
+                text="API rate limit exceeded",
+                headers={"x-ratelimit-remaining": "0", "x-ratelimit-reset": "1e12"},
+            )
+        return httpx.Response(
+            200,
+            json=[],
+            headers={"x-ratelimit-remaining": "4999", "x-ratelimit-reset": "1e12"},
+        )
+
+    tokens = TokenPool(["first", "second"])
+    tokens.update("first", {"x-ratelimit-remaining": "10"})
+    tokens.update("second", {"x-ratelimit-remaining": "5"})
+
+    create_api, _ = mocked_api
+    gh_api = create_api(handler, tokens=tokens)
+
+    assert gh_api.request(gh_api.format_url(1)) == []
+    assert gh_api.request(gh_api.format_url(2)) == []
+    assert used == ["first", "second", "second"]
+
+
+@pytest.mark.unit
+def test_probe_skips_refresh(mocked_api):
+    create_api, calls = mocked_api
+    data = create_api(total=45).collect_items()
+    assert len(data["data"]) == 45
+    assert data["probe"] == {"count": 45, "newest": "owner/repo-0"}
+
+    calls.clear()
+    assert create_api(total=45, refresh=True).collect_items()["data"] == data["data"]
+    assert len(calls) == 1
+
+    calls.clear()
+    create_api(total=45, refresh=True, force=True).collect_items()
+    assert len(calls) > 1
+
+    capped = create_api(total=45, refresh=True, max_results=10)
+    assert len(capped.collect_items()["data"]) == 10
+    calls.clear()
+    assert len(capped.collect_items()["data"]) == 10
+    assert len(calls) == 1
+    assert len(create_api(total=45, refresh=True).collect_items()["data"]) == 45
+
+
+@pytest.mark.unit
+def test_failed_probe_not_repeated(mocked_api, starred_handler):
+    probes: list[str] = []
+    starred = starred_handler(5, [])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params["per_page"] == "1":
+            probes.append(str(request.url))
+            return httpx.Response(429, text="API rate limit exceeded")
+        return starred(request)
+
+    create_api, _ = mocked_api
+    gh_api = create_api(handler)
+    gh_api.collect_items()
+    gh_api.refresh = True
+    assert len(gh_api.collect_items()["data"]) == 5
+    assert len(probes) == 2
+
+
+@pytest.mark.unit
+def test_recover_invalid_cache(mocked_api):
+    create_api, _ = mocked_api
+    gh_api = create_api(total=5)
+    gh_api.cache_file.write_text(
+        json.dumps(
+            {
+                "data": ["owner/repo-0"],
+                "ignore": ["owner/repo-1"],
+                "history": [1],
+                "date": 0,
+                "extra": True,
+            }
+        )
+    )
+
+    data = gh_api.collect_items()
+
+    assert len(data["data"]) == 5
+    assert data["ignore"] == ["owner/repo-1"]
+    assert data["history"] == []
+    assert data["extra"] is True
+
+
+@pytest.mark.unit
+def test_crawl_records_index(tmp_path, mocked_api):
+    create_api, _ = mocked_api
+    gh_api = create_api(total=5, account="someone", index=CacheIndex(tmp_path))
+    gh_api.collect_items()
+
+    entry = CacheIndex(tmp_path).data[gh_api.cache_file.name]
+    assert entry["size"] == gh_api.cache_file.stat().st_size
+    assert entry["account"] == "someone"
@@ -4,9 +4,10 @@ import pytest
 
 
 @pytest.mark.unit()
-def test_cli(set_user_settings):
+def test_cli(set_user_settings, isolated_cache, tmp_path):
     process = subprocess.Popen(
-        ["gh-star", "star", set_user_settings[0], "--total", "3"],
+        ["gh-star", "star", set_user_settings[0], "--total", "3", "--no_details"],
+        cwd=tmp_path,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
     )
@@ -17,9 +18,10 @@ def test_cli(set_user_settings):
 
 
 @pytest.mark.unit()
-def test_cli_repo(set_user_settings):
+def test_cli_repo(set_user_settings, isolated_cache, tmp_path):
     process = subprocess.Popen(
-        ["gh-star", "repo", set_user_settings[0], "--total", "3"],
+        ["gh-star", "repo", set_user_settings[0], "--total", "3", "--no_details"],
+        cwd=tmp_path,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
     )
@@ -30,7 +32,7 @@ def test_cli_repo(set_user_settings):
 
 
 @pytest.mark.integration()
-def test_cli_integration(set_user_settings):
+def test_cli_integration(set_user_settings, isolated_cache, tmp_path):
     process = subprocess.Popen(
         [
             "gh-star",
@@ -39,7 +41,9 @@ def test_cli_integration(set_user_settings):
             "--refresh",
             "--max_results",
             str(set_user_settings[2]),
+            "--no_details",
         ],
+        cwd=tmp_path,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
     )
@@ -6,7 +6,16 @@ import mock  # type: ignore[import]
 import pytest
 from cleo.application import Application
 from cleo.testers.command_tester import CommandTester
-from github_random_star.commands import RepoCommand, StarCommand
+from github_random_star.cache import CacheIndex
+from github_random_star.commands import (
+    CacheCommand,
+    RepoCommand,
+    StarCommand,
+    StatsCommand,
+)
+from github_random_star.serializer import SerializationError, available_serializers
+from github_random_star.stats import PerformanceStats
+from github_random_star.utility import NoCandidatesError
 
 
 @pytest.mark.unit
@@ -16,7 +25,7 @@ def test_cache_path(cache_location):
 
 
 @pytest.mark.unit
-def test_random_selection(set_seed, cache_location, get_data, set_user_settings):
+def test_random_selection(set_seed, isolated_cache, get_data, set_user_settings):
     app = Application()
     cmd = StarCommand()
     app.add(cmd)
@@ -25,11 +34,11 @@ def test_random_selection(set_seed, cache_location, get_data, set_user_settings)
     tester = CommandTester(command)
 
     with mock.patch.object(builtins, "input", lambda _: 2):
-        assert tester.execute(set_user_settings[0]) == 0
+        assert tester.execute(f"{set_user_settings[0]} --no_details") == 0
 
 
 @pytest.mark.unit
-def test_ignore_file(set_seed, cache_location, set_user_settings, get_data):
+def test_ignore_file(set_seed, isolated_cache, set_user_settings, get_data):
     user, max_results, _ = set_user_settings
     pre_len = len(get_data["ignore"])
     app = Application()
@@ -40,9 +49,11 @@ def test_ignore_file(set_seed, cache_location, set_user_settings, get_data):
     tester = CommandTester(command)
 
     with mock.patch.object(builtins, "input", lambda _: 2.1):
-        assert tester.execute(f"{user} --max_results {max_results}") == 0
+        assert (
+            tester.execute(f"{user} --max_results {max_results} --no_details") == 0
+        )
 
-    cl = cache_location / f"{user}_cache.json"
+    cl = isolated_cache / f"{user}_cache.json"
     with cl.open() as f:
         post_len = len(json.load(f)["ignore"])
 
@@ -101,3 +112,169 @@ def test_open_url(capsys, monkeypatch):
 
     assert expected_message in out
     assert err == ""
+
+
+@pytest.mark.unit
+def test_stats(tmp_path):
+    stats = PerformanceStats(tmp_path)
+    stats.record_cache("star:ddkasa", hit=False)
+    stats.record_cache("star:ddkasa", hit=True)
+    stats.record_refresh("star:ddkasa", 3.0, 10, 2048)
+    stats.save()
+
+    summary = PerformanceStats(tmp_path).summary()["star:ddkasa"]
+
+    assert summary["cache_hit_ratio"] == 0.5
+    assert summary["requests_per_refresh"] == 10
+    assert summary["crawl_latency"]["<=5s"] == 1
+
+
+@pytest.mark.unit
+def test_stats_command(isolated_cache, set_user_settings):
+    app = Application()
+    app.add(StarCommand())
+    app.add(StatsCommand())
+
+    with mock.patch.object(builtins, "input", lambda _: 1):
+        star = CommandTester(app.find("star"))
+        assert star.execute(f"{set_user_settings[0]} --no_details") == 0
+
+    tester = CommandTester(app.find("stats"))
+    assert tester.execute(f"{set_user_settings[0]} --json") == 0
+
+    summary = json.loads(tester.io.fetch_output())[f"star:{set_user_settings[0]}"]
+    assert summary["cache_hit_ratio"] == 1.0
+    assert summary["picks"] == 1
+    assert summary["refreshes"] == 0
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "serializer",
+    available_serializers(),
+    ids=lambda serializer: serializer.NAME,
+)
+def test_serializer(serializer, cache_location):
+    raw = (cache_location / "ddkasa_cache.json").read_bytes()
+    cache = serializer.decode_cache(raw)
+    assert serializer.decode_cache(serializer.encode(cache)) == cache
+
+    cache["extra"] = {"from": "a newer version"}
+    assert serializer.decode_cache(serializer.encode(cache))["extra"] == cache["extra"]
+
+    with pytest.raises(SerializationError):
+        serializer.decode_cache(b'{"data": [1], "ignore": [], "history": []}')
+    with pytest.raises(SerializationError):
+        serializer.decode_cache(b"{")
+
+    cache["probe"] = {"count": "30", "newest": None}
+    with pytest.raises(SerializationError):
+        serializer.decode_cache(serializer.encode(cache))
+
+
+@pytest.mark.unit
+def test_cache_index(tmp_path):
+    index = CacheIndex(tmp_path)
+    for account, cache_format in (("old", 0), ("lru", 1), ("new", 1)):
+        file = tmp_path / f"{account}_cache.json"
+        cache = {
+            "data": [f"owner/repo-{i}" for i in range(100)],
+            "ignore": [f"{account}/ignored"],
+            "history": [f"{account}/picked"],
+            "date": "2024-06-12T15:51:09",
+        }
+        file.write_text(json.dumps(cache))
+        index.touch(file, account, "1.2.0", cache_format)
+    index.save()
+
+    index = CacheIndex(tmp_path)
+    budget = 2 * index.data["new_cache.json"]["size"]
+    trimmed = index.collect(budget, keep={"new_cache.json"})
+
+    assert trimmed == ["old_cache.json", "lru_cache.json"]
+    assert sum(entry["size"] for entry in index.data.values()) <= budget
+    for account in ("old", "lru"):
+        cache = json.loads((tmp_path / f"{account}_cache.json").read_text())
+        assert "data" not in cache
+        assert cache["ignore"] == [f"{account}/ignored"]
+        assert cache["history"] == [f"{account}/picked"]
+
+    assert index.collect(0, keep={"new_cache.json"}) == []
+    index.rebuild()
+    assert index.data["old_cache.json"]["trimmed"]
+    assert not index.data["new_cache.json"]["trimmed"]
+
+
+@pytest.mark.unit
+def test_cache_command(isolated_cache, set_user_settings):
+    app = Application()
+    app.add(CacheCommand())
+
+    tester = CommandTester(app.find("cache"))
+
+    assert tester.execute("") == 0
+    assert f"{set_user_settings[0]}_cache.json" in tester.io.fetch_output()
+    assert (isolated_cache / CacheIndex.FILE_NAME).exists()
+
+    assert tester.execute("--gc --budget 0") == 0
+    cache = json.loads(
+        (isolated_cache / f"{set_user_settings[0]}_cache.json").read_text()
+    )
+    assert "data" not in cache
+    assert "ignore" in cache
+
+
+@pytest.mark.unit
+def test_item_selection_quick_ignore(monkeypatch):
+    cmd = StarCommand()
+    options = {"total": 3, "max_history": 100, "ignore": False}
+    monkeypatch.setattr(cmd, "option", options.get)
+    monkeypatch.setattr(cmd, "open_url", lambda _: None)
+    monkeypatch.setattr(cmd, "line", lambda *_, **__: None)
+
+    data = {"data": ["a/a", "b/b", "c/c"], "ignore": [], "history": []}
+    with mock.patch.object(builtins, "input", lambda _: "1.1"):
+        cmd.item_selection(data, Path(), persist=False)
+
+    assert data["ignore"] == []
+
+
+@pytest.mark.unit
+def test_item_selection_no_candidates(monkeypatch):
+    cmd = StarCommand()
+    options = {"total": 3, "max_history": 100, "ignore": False}
+    monkeypatch.setattr(cmd, "option", options.get)
+    monkeypatch.setattr(cmd, "line", lambda *_, **__: None)
+
+    data = {"data": ["a/a"], "ignore": ["a/a"], "history": []}
+    with pytest.raises(NoCandidatesError):
+        cmd.item_selection(data, Path())
+
+
+@pytest.mark.unit
+def test_user_selection_details(monkeypatch, capsys):
+    cmd = StarCommand()
+    lines: list[str] = []
+    monkeypatch.setattr(cmd, "option", {"total": 1}.get)
+    monkeypatch.setattr(cmd, "line", lambda text, **_: lines.append(text))
+
+    info = {"description": None, "language": "Python", "stars": 5, "pushed_at": None}
+    arrived = {}
+
+    class Details:
+        def prefetch(self, names, callback):
+            arrived.update(dict.fromkeys(names, callback))
+
+    def answer(_):
+        for name, callback in arrived.items():
+            callback(name, info)
+        return next(answers)
+
+    answers = iter(["", "1"])
+    with mock.patch.object(builtins, "input", answer):
+        assert cmd.user_selection({"a/a"}, Details()) == ("a/a", 1)
+
+    out = capsys.readouterr().out
+    assert out.count("1. a/a\n") == 1
+    assert out.count("1. a/a - Python · ★ 5\n") == 1
+    assert not any("range" in line for line in lines)